@@ -0,0 +1,255 @@
+# batch_scoring.py - Scoring par lots hors interface (CSV/Parquet -> CSV/Parquet)
+# Usage: python -m batch_scoring ENTREE SORTIE [--moteur regles|modele] [--workers N] [--shard-rows 200000]
+#
+# ENTREE est un export de la table patients (modalités du formulaire de diagnostic)
+# ou un registre au format nba.csv. Le fichier est découpé en fragments (plages d'octets
+# pour le CSV, groupes de lignes pour le Parquet) lus, encodés et scorés par un pool de
+# processus; la sortie reprend les colonnes d'entrée, dans l'ordre, avec prediction,
+# probabilite et niveau_risque recalculés.
+import argparse
+import io
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+logging.disable(logging.WARNING)
+
+import app  # noqa: E402
+
+SHARD_ROWS = 200_000
+SCORING_ENGINES = {'regles': app.RuleBasedScorer.name, 'modele': app.LogisticModelScorer.name}
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+SCORE_COLUMNS = ['prediction', 'probabilite', 'niveau_risque']
+
+# Moteur de scoring du processus (initialisé une fois par processus du pool)
+_scorer = None
+
+def _is_parquet(path):
+    return str(path).lower().endswith(PARQUET_SUFFIXES)
+
+def make_scorer(engine='regles'):
+    """Moteur de scoring demandé; échoue explicitement si TB_model.pkl est illisible"""
+    if engine == 'modele':
+        return app.LogisticModelScorer(app.joblib.load(app.MODEL_PATH))
+    return app.RuleBasedScorer()
+
+def _init_worker(engine):
+    global _scorer
+    _scorer = make_scorer(engine)
+
+def input_columns(path):
+    """Noms des colonnes du fichier d'entrée, sans le lire en entier"""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        return list(pq.ParquetFile(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def is_register(columns):
+    """Vrai pour un registre au schéma anglais (format nba.csv)"""
+    return set(app.REGISTER_COLUMN_MAP).issubset(columns)
+
+def check_columns(columns):
+    if is_register(columns):
+        return
+    missing = [column for column in app.PREDICTION_FEATURES if column not in columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes pour le scoring: {', '.join(missing)}")
+
+def column_types(columns):
+    """Type SQL fixe de chaque colonne (schéma patients, registre nba.csv; texte sinon)
+
+    Fixé une fois pour tout le fichier: un fragment où une colonne est vide ne doit
+    pas en changer le type (inférence pandas par fragment).
+    """
+    types = dict(app.PATIENT_COLUMN_TYPES, id='INT')
+    types.update({source: types[column] for source, column in app.REGISTER_COLUMN_MAP.items()})
+    return {column: types.get(column, 'VARCHAR') for column in columns}
+
+def csv_dtypes(columns):
+    """dtypes passés à read_csv: les colonnes non numériques restent du texte"""
+    return {column: str for column, sql_type in column_types(columns).items()
+            if not sql_type.startswith(('INT', 'FLOAT'))}
+
+def output_schema(path):
+    """Schéma Arrow de la sortie: colonnes d'entrée puis prediction, probabilite, niveau_risque"""
+    import pyarrow as pa
+
+    columns = input_columns(path)
+    columns += [column for column in SCORE_COLUMNS if column not in columns]
+    types = {column: app._arrow_type(sql_type) for column, sql_type in column_types(columns).items()}
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        source = pq.ParquetFile(path).schema_arrow
+        types.update({field.name: field.type for field in source if field.name not in SCORE_COLUMNS})
+    return pa.schema([(column, types[column]) for column in columns])
+
+def plan_shards(path, shard_rows=SHARD_ROWS):
+    """Découpe l'entrée en fragments d'environ shard_rows lignes
+
+    CSV: plages d'octets alignées sur les fins de ligne (champs sans saut de ligne),
+    avec les dtypes de csv_dtypes. Parquet: groupes de lignes consécutifs.
+    """
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        metadata = pq.ParquetFile(path).metadata
+        shards, current, rows = [], [], 0
+        for index in range(metadata.num_row_groups):
+            current.append(index)
+            rows += metadata.row_group(index).num_rows
+            if rows >= shard_rows:
+                shards.append(('parquet', path, tuple(current)))
+                current, rows = [], 0
+        if current:
+            shards.append(('parquet', path, tuple(current)))
+        return shards
+
+    size = os.path.getsize(path)
+    with open(path, 'rb') as source:
+        header = source.readline()
+        dtypes = csv_dtypes(pd.read_csv(io.BytesIO(header), nrows=0).columns)
+        start = source.tell()
+        sample = source.read(1 << 20)
+        bytes_per_row = len(sample) / max(sample.count(b'\n'), 1)
+        shard_bytes = max(int(shard_rows * bytes_per_row), 1)
+        shards = []
+        while start < size:
+            end = min(start + shard_bytes, size)
+            if end < size:
+                source.seek(end)
+                source.readline()
+                end = source.tell()
+            shards.append(('csv', path, header, start, end, dtypes))
+            start = end
+    return shards
+
+def read_shard(shard):
+    if shard[0] == 'parquet':
+        import pyarrow.parquet as pq
+        _, path, row_groups = shard
+        return pq.ParquetFile(path).read_row_groups(list(row_groups)).to_pandas()
+    _, path, header, start, end, dtypes = shard
+    with open(path, 'rb') as source:
+        source.seek(start)
+        data = source.read(end - start)
+    return pd.read_csv(io.BytesIO(header + data), dtype=dtypes)
+
+def score_frame(df, scorer):
+    """Ajoute prediction, probabilite et niveau_risque à un bloc (patients ou registre)"""
+    if is_register(df.columns):
+        scored = app.map_register_chunk(df, scorer=scorer)
+        predictions, probabilities = scored['prediction'], scored['probabilite']
+    else:
+        # Même encodage que le formulaire de diagnostic_page (FORM_ENCODINGS)
+        predictions, probabilities = scorer.predict_batch(app.encode_patient_frame(df))
+    return df.assign(prediction=predictions, probabilite=probabilities,
+                     niveau_risque=app.calculate_risk_level_batch(probabilities)[0])
+
+def _score_shard(shard):
+    return score_frame(read_shard(shard), _scorer)
+
+def _ordered_results(shards, engine, workers):
+    """Résultats des fragments dans l'ordre d'entrée, au plus 2 × workers fragments en vol"""
+    if workers <= 1 or len(shards) <= 1:
+        _init_worker(engine)
+        for shard in shards:
+            yield _score_shard(shard)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,)) as pool:
+        pending = deque()
+        for shard in shards:
+            pending.append(pool.submit(_score_shard, shard))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class ScoredWriter:
+    """Écrit les blocs scorés dans l'ordre: CSV (en-tête une fois) ou Parquet (un groupe par bloc)
+
+    En Parquet, chaque bloc est converti vers schema (voir output_schema).
+    """
+
+    def __init__(self, path, schema=None):
+        self.path = path
+        self.parquet = _is_parquet(path)
+        self._writer = None
+        self._schema = schema
+        self._started = False
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def score_file(source, output, engine='regles', workers=None, shard_rows=SHARD_ROWS, on_shard=None):
+    """Score un fichier CSV/Parquet fragment par fragment et écrit le résultat dans output
+
+    Retourne les statistiques (lignes, fragments, durée, lignes/seconde).
+    """
+    check_columns(input_columns(source))
+    shards = plan_shards(source, shard_rows)
+    workers = workers or os.cpu_count() or 1
+
+    stats = {'rows': 0, 'shards': len(shards), 'workers': workers, 'seconds': 0.0, 'rows_per_second': 0.0}
+    start = time.perf_counter()
+    writer = ScoredWriter(output, output_schema(source) if _is_parquet(output) else None)
+    try:
+        for done, scored in enumerate(_ordered_results(shards, engine, workers), start=1):
+            writer.write(scored)
+            stats['rows'] += len(scored)
+            stats['seconds'] = time.perf_counter() - start
+            stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+            if on_shard:
+                on_shard(done, stats)
+    finally:
+        writer.close()
+    return stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch_scoring",
+                                     description="Scoring tuberculose par lots (CSV/Parquet)")
+    parser.add_argument("source", help="Fichier d'entrée .csv ou .parquet")
+    parser.add_argument("output", help="Fichier de sortie .csv ou .parquet")
+    parser.add_argument("--moteur", choices=list(SCORING_ENGINES), default='regles',
+                        help="Règles expertes (regles) ou TB_model.pkl (modele)")
+    parser.add_argument("--workers", type=int, default=None, help="Processus (défaut: nombre de CPU)")
+    parser.add_argument("--shard-rows", type=int, default=SHARD_ROWS, help="Lignes par fragment")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    def progress(done, stats):
+        print(f"\rfragment {done}/{stats['shards']}  {stats['rows']:>12,} lignes  "
+              f"{stats['rows_per_second']:>10,.0f} lignes/s", end="", file=sys.stderr, flush=True)
+
+    try:
+        stats = score_file(args.source, args.output, engine=args.moteur, workers=args.workers,
+                           shard_rows=args.shard_rows, on_shard=progress)
+    except (OSError, ValueError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
+    print(f"\n{stats['rows']:,} lignes scorées ({SCORING_ENGINES[args.moteur]}) en {stats['seconds']:.1f} s "
+          f"avec {stats['workers']} processus: {stats['rows_per_second']:,.0f} lignes/s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
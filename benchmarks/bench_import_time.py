@@ -0,0 +1,65 @@
+# benchmarks/bench_import_time.py - Coût des imports et premier rendu de la page de connexion
+# Usage: python benchmarks/bench_import_time.py [nombre_de_modules_affichés]
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Premier rendu à froid: import de app.py + exécution du script jusqu'à login_register_page
+FIRST_RENDER_SCRIPT = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+ready = time.perf_counter()
+at = AppTest.from_file({app_path!r}, default_timeout=120)
+at.run()
+assert not at.exception, at.exception
+assert at.session_state.logged_in is False
+print(f"{{(time.perf_counter() - ready) * 1000:.0f}}")
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def import_time_report(top=15):
+    """Temps d'import cumulé par module de premier niveau (format -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    per_package = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        total_us += int(self_us)
+        if (len(indent) - 1) // 2 == 1:  # imports directs de app.py
+            package = module.split('.')[0]
+            per_package[package] = per_package.get(package, 0) + int(cumulative_us)
+
+    print(f"import app: {total_us / 1000:.0f} ms au total")
+    print(f"{'module':<28}{'cumulé (ms)':>12}")
+    for package, cumulative_us in sorted(per_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<28}{cumulative_us / 1000:>12.1f}")
+
+def first_render_ms(repeat=3):
+    """Médiane du temps de premier rendu de login_register_page, processus neuf à chaque fois"""
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_RENDER_SCRIPT.format(app_path=os.path.join(ROOT, "app.py"))],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return sorted(timings)[len(timings) // 2]
+
+def main():
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    import_time_report(top)
+    print(f"\npremier rendu de login_register_page: {first_render_ms():.0f} ms (médiane de 3)")
+
+if __name__ == "__main__":
+    main()
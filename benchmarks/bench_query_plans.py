@@ -0,0 +1,65 @@
+# benchmarks/bench_query_plans.py - Plans d'exécution avant/après les index secondaires
+# Usage: python benchmarks/bench_query_plans.py [nombre_de_patients]
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+QUERIES = {
+    "recherche par CIN": ("SELECT * FROM patients WHERE cin = :cin", {'cin': 'AB0012345'}),
+    "filtre par date": ("SELECT COUNT(*) FROM patients WHERE date_consultation >= :d", {'d': '2024-12-01'}),
+    "filtre par risque": ("SELECT COUNT(*) FROM patients WHERE niveau_risque = :r", {'r': 'Élevé'}),
+    "vue par médecin": ("SELECT * FROM patients WHERE medecin_traitant = :m LIMIT 50", {'m': 'Dr Martin'}),
+}
+
+def seed_patients(engine, n_rows, seed=42):
+    """Insère n_rows patients aléatoires (colonnes utiles aux requêtes seulement)"""
+    rng = np.random.default_rng(seed)
+    medecins = ['Dr Martin'] + [f"Dr {nom} {i}" for i in range(20)
+                                for nom in ('Dupont', 'Martin', 'Bernard', 'Petit', 'Robert')]
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D')
+    rows = pd.DataFrame({
+        'cin': [f"AB{i:07d}" for i in range(n_rows)],
+        'age': rng.integers(1, 100, n_rows),
+        'niveau_risque': rng.choice(['Faible', 'Modéré', 'Élevé'], n_rows, p=[0.6, 0.3, 0.1]),
+        'medecin_traitant': rng.choice(medecins, n_rows),
+        'date_consultation': dates.strftime('%Y-%m-%d'),
+    })
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            f"INSERT INTO patients ({', '.join(rows.columns)}) VALUES ({', '.join('?' * len(rows.columns))})",
+            list(rows.itertuples(index=False, name=None))
+        )
+
+def report(engine, label, repeat=20):
+    print(f"\n=== {label} ===")
+    with engine.connect() as conn:
+        for name, (sql, params) in QUERIES.items():
+            plan = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params).fetchall()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(text(sql), params).fetchall()
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            print(f"{name:<20} {elapsed:8.3f} ms  plan: {' | '.join(row[-1] for row in plan)}")
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        app.run_migrations(engine, target_version=1)
+        seed_patients(engine, n_rows)
+        report(engine, f"sans index secondaires ({n_rows} patients)")
+        app.run_migrations(engine)
+        report(engine, f"avec index secondaires ({n_rows} patients)")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
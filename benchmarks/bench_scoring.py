@@ -0,0 +1,54 @@
+# benchmarks/bench_scoring.py - Latence des moteurs de scoring par taille de lot
+# Usage: python benchmarks/bench_scoring.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+BATCH_SIZES = [1, 100, 10_000]
+
+def random_encoded_features(n_rows, seed=42):
+    """Matrice encodée aléatoire dans l'ordre de app.PREDICTION_FEATURES"""
+    rng = np.random.default_rng(seed)
+    highs = {
+        'age': 100, 'genre': 2, 'douleur_thoracique': 4, 'intensite_toux': 11,
+        'essoufflement': 11, 'fatigue': 11, 'perte_poids': 21, 'fievre': 4,
+        'sueurs_nocturnes': 4, 'production_crachats': 4, 'sang_crachats': 3,
+        'tabagisme': 4, 'antecedents_tb': 3,
+    }
+    return np.column_stack([
+        rng.integers(0, highs[column], n_rows) for column in app.PREDICTION_FEATURES
+    ]).astype(float)
+
+def time_per_call(func, features, min_duration=0.5):
+    """Temps moyen par appel (en ms), répété jusqu'à min_duration secondes"""
+    func(features)
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func(features)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_duration:
+            return elapsed / calls * 1000
+
+def main():
+    model = app.joblib.load(app.MODEL_PATH)
+    engines = {
+        "règles (NumPy)": app.RuleBasedScorer().predict_batch,
+        "modèle sklearn": app.LogisticModelScorer(model, fast_path=False).predict_batch,
+        "modèle NumPy": app.LogisticModelScorer(model, fast_path=True).predict_batch,
+    }
+
+    print(f"{'moteur':<18}" + "".join(f"{f'n={n}':>14}" for n in BATCH_SIZES) + "   (ms/appel)")
+    for name, func in engines.items():
+        timings = [time_per_call(func, random_encoded_features(n)) for n in BATCH_SIZES]
+        print(f"{name:<18}" + "".join(f"{t:>14.3f}" for t in timings))
+
+if __name__ == "__main__":
+    main()
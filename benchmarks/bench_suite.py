@@ -0,0 +1,239 @@
+# benchmarks/bench_suite.py - Chemins critiques de l'application à plusieurs tailles de données
+# Usage: python benchmarks/bench_suite.py [--sizes 1k 20k 1M] [--cases predict load ...] [--repeat 3]
+#                                         [--output resultats.json] [--baseline reference.json]
+#
+# S'exécute sans serveur Streamlit (mode « bare »: les appels st.* sont sans effet).
+# Tailles: 1k = 1 000 premières lignes de nba.csv, 20k = nba.csv complet,
+# 1M = patients synthétiques (app.write_synthetic_patients, graine fixe).
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Hors serveur, chaque appel st.* émet un avertissement « missing ScriptRunContext »
+logging.disable(logging.WARNING)
+
+import app  # noqa: E402
+
+NBA_PATH = os.path.join(ROOT, "nba.csv")
+SIZES = {"1k": 1_000, "20k": 20_000, "1M": 1_000_000}
+SINGLE_CALLS = 1_000
+SAVED_PATIENTS = 1_000
+# Écart toléré avant de signaler une régression, et écart absolu minimal (bruit des cas rapides)
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_SECONDS = 0.005
+
+CASES = {}
+
+def case(name):
+    """Enregistre un cas: la fonction reçoit le contexte et retourne (préparation, mesure)"""
+    def register(func):
+        CASES[name] = func
+        return func
+    return register
+
+class Workload:
+    """Base SQLite migrée et peuplée (import de nba.csv ou patients synthétiques), plus les données dérivées"""
+
+    def __init__(self, label, n_rows, workdir):
+        self.label = label
+        self.engine = app.create_sqlite_engine(os.path.join(workdir, f"bench_{label}.db"))
+        app.run_migrations(self.engine)
+
+        nba = pd.read_csv(NBA_PATH)
+        if n_rows <= len(nba):
+            register_path = os.path.join(workdir, f"registre_{label}.parquet")
+            nba.head(n_rows).to_parquet(register_path, index=False)
+            app.import_patient_register(self.engine, register_path)
+        else:
+            app.write_synthetic_patients(self.engine, n_rows, seed=42)
+
+        self.df = app.load_patient_data(self.engine)
+        self.encoded = app.encode_patient_frame(self.df)
+        self.patients = [dict(zip(app.PREDICTION_FEATURES, row)) for row in
+                         self.encoded[app.PREDICTION_FEATURES].head(SINGLE_CALLS).itertuples(index=False)]
+        self.search_term = str(self.df['cin'].iloc[len(self.df) // 2])[:7]
+
+    def analyzer(self, preprocess=False):
+        """Analyseur neuf (caches de prétraitement vidés)"""
+        app.get_preprocessing_cache.clear()
+        analyzer = app.AdvancedDataAnalyzer(df=self.df)
+        if preprocess:
+            analyzer.preprocess_data(target_column='prediction')
+        return analyzer
+
+# =============================================================================
+# Cas mesurés
+# =============================================================================
+@case("predict_tuberculosis_batch")
+def bench_predict_batch(ctx):
+    return None, lambda _: app.predict_tuberculosis_batch(ctx.encoded)
+
+@case("predict_tuberculosis (1 000 appels)")
+def bench_predict_single(ctx):
+    def run(_):
+        for patient in ctx.patients:
+            app.predict_tuberculosis(patient)
+    return None, run
+
+@case("load_patient_data (à froid)")
+def bench_load_cold(ctx):
+    return app.get_patient_cache.clear, lambda _: app.load_patient_data(ctx.engine)
+
+@case("load_patient_data (cache)")
+def bench_load_cached(ctx):
+    return lambda: app.load_patient_data(ctx.engine), lambda _: app.load_patient_data(ctx.engine)
+
+@case("save_patient_data (1 000 patients)")
+def bench_save(ctx):
+    records = ctx.df.drop(columns=['id', 'created_at'], errors='ignore').head(SAVED_PATIENTS)
+    records = records.to_dict('records')
+
+    def run(_):
+        for record in records:
+            app.save_patient_data(ctx.engine, record)
+        app.get_write_queue(ctx.engine, str(ctx.engine.url)).join()
+    return None, run
+
+@case("get_dashboard_aggregates")
+def bench_aggregates(ctx):
+    return None, lambda _: app.get_dashboard_aggregates(ctx.engine, ctx.df)
+
+@case("search_patients (FTS5)")
+def bench_search_fts(ctx):
+    return None, lambda _: app.search_patients(ctx.engine, ctx.df, ctx.search_term)
+
+@case("search_patients (index mémoire, à froid)")
+def bench_search_memory(ctx):
+    return app.get_search_index.clear, lambda _: app.search_patients(None, ctx.df, ctx.search_term)
+
+@case("_clean_dataframe")
+def bench_clean(ctx):
+    analyzer = ctx.analyzer()
+    return None, lambda _: analyzer._clean_dataframe(ctx.df)
+
+@case("preprocess_data")
+def bench_preprocess(ctx):
+    return ctx.analyzer, lambda analyzer: analyzer.preprocess_data(target_column='prediction')
+
+@case("perform_clustering")
+def bench_clustering(ctx):
+    def setup():
+        app.get_kmeans_cache.clear()
+        return ctx.analyzer(preprocess=True)
+    return setup, lambda analyzer: analyzer.perform_clustering(n_clusters=3)
+
+@case("advanced_feature_analysis")
+def bench_features(ctx):
+    def setup():
+        app.get_feature_importance_cache.clear()
+        return ctx.analyzer(preprocess=True)
+    return setup, lambda analyzer: analyzer.advanced_feature_analysis()
+
+# =============================================================================
+# Exécution, rapport JSON et comparaison à une référence
+# =============================================================================
+def time_case(ctx, name, repeat):
+    setup, run = CASES[name](ctx)
+    runs = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state)
+        runs.append(time.perf_counter() - start)
+    return {'median_s': statistics.median(runs), 'min_s': min(runs), 'runs': runs}
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    import sklearn
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+def compare(results, baseline, tolerance):
+    """Compare les médianes à la référence; retourne la liste des régressions"""
+    regressions = []
+    print(f"\n{'taille':<6} {'cas':<44}{'référence':>11}{'actuel':>11}{'ratio':>8}")
+    for size, cases in results['results'].items():
+        for name, current in cases.items():
+            reference = baseline.get('results', {}).get(size, {}).get(name)
+            if not reference:
+                continue
+            before, after = reference['median_s'], current['median_s']
+            ratio = after / before if before else float('inf')
+            regressed = ratio > 1 + tolerance and after - before > MIN_REGRESSION_SECONDS
+            flag = "  RÉGRESSION" if regressed else ""
+            print(f"{size:<6} {name:<44}{before:>10.4f}s{after:>10.4f}s{ratio:>8.2f}{flag}")
+            if regressed:
+                regressions.append({'size': size, 'case': name, 'baseline_s': before,
+                                    'current_s': after, 'ratio': ratio})
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks des chemins critiques de app.py")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="Sous-chaînes des noms de cas à exécuter (par défaut: tous)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=None, help="Résultats JSON de référence")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Ralentissement relatif toléré avant de signaler une régression")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    selected = [name for name in CASES
+                if not args.cases or any(pattern in name for pattern in args.cases)]
+    results = {'environment': environment(), 'repeat': args.repeat, 'results': {}}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            start = time.perf_counter()
+            ctx = Workload(size, SIZES[size], workdir)
+            print(f"\n=== {size}: {len(ctx.df)} patients (préparation {time.perf_counter() - start:.1f} s) ===")
+            size_results = results['results'][size] = {}
+            for name in selected:
+                size_results[name] = time_case(ctx, name, args.repeat)
+                print(f"{name:<44}{size_results[name]['median_s']:>10.4f} s (médiane)")
+            ctx.engine.dispose()
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(results, output, indent=2, ensure_ascii=False)
+    print(f"\nRésultats écrits dans {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {args.tolerance:.0%}")
+            sys.exit(1)
+        print("\nAucune régression")
+
+if __name__ == "__main__":
+    main()
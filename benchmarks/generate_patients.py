@@ -0,0 +1,53 @@
+# benchmarks/generate_patients.py - Génère des patients synthétiques pour les tests de charge
+# Usage: python benchmarks/generate_patients.py NOMBRE CIBLE [--seed 42] [--signal 1.0] [--chunksize 50000]
+#   CIBLE: fichier .parquet ou URL SQLAlchemy (ex. sqlite:///data/charge.db, mysql+mysqlconnector://...)
+import argparse
+import logging
+import os
+import sys
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.WARNING)
+
+import app  # noqa: E402
+
+def signal_type(value):
+    """Type argparse de --signal: réel compris entre 0 et 1"""
+    signal = float(value)
+    if not 0 <= signal <= 1:
+        raise argparse.ArgumentTypeError(f"doit être compris entre 0 et 1: {value}")
+    return signal
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Patients synthétiques au schéma de la table patients")
+    parser.add_argument("rows", type=int, help="Nombre de patients à générer")
+    parser.add_argument("target", help="Fichier .parquet ou URL SQLAlchemy de la base")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--signal", type=signal_type, default=1.0,
+                        help="Lien symptômes/statut tuberculeux (0 = indépendants, comme nba.csv)")
+    parser.add_argument("--prevalence", type=float, default=app.SYNTHETIC_PREVALENCE)
+    parser.add_argument("--chunksize", type=int, default=app.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--first-id", type=int, default=1, help="Numéro du premier CIN (SY00000001)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.target.lower().endswith((".parquet", ".pq")):
+        target = args.target
+    else:
+        target = app.create_sqlite_engine(args.target[len("sqlite:///"):]) \
+            if args.target.startswith("sqlite:///") else create_engine(args.target)
+        app.run_migrations(target)
+
+    def progress(stats):
+        print(f"\r{stats['rows']:>12,} patients  {stats['rows_per_second']:>10,.0f} lignes/s", end="", flush=True)
+
+    stats = app.write_synthetic_patients(target, args.rows, chunksize=args.chunksize, on_chunk=progress,
+                                         seed=args.seed, signal=args.signal,
+                                         prevalence=args.prevalence, first_id=args.first_id)
+    print(f"\n{stats['rows']:,} patients écrits en {stats['seconds']:.1f} s")
+
+if __name__ == "__main__":
+    main()
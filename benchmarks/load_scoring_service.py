@@ -0,0 +1,124 @@
+# benchmarks/load_scoring_service.py - Générateur de charge pour scoring_service (une seule machine)
+# Usage: python benchmarks/load_scoring_service.py [--concurrency 64] [--duration 10]
+#                                                  [--port 8765] [--spawn] [--max-batch 64] [--max-wait-ms 5]
+#
+# Chaque client garde une connexion keep-alive et enchaîne des POST /score d'un
+# patient aléatoire. --spawn démarre le service le temps de la mesure.
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.disable(logging.WARNING)
+
+import app  # noqa: E402
+
+def random_patient(rng):
+    patient = {column: rng.choice(list(values)) for column, values in app.FORM_ENCODINGS.items()}
+    patient.update({
+        'age': rng.randint(18, 90), 'intensite_toux': rng.randint(0, 10), 'essoufflement': rng.randint(0, 10),
+        'fatigue': rng.randint(0, 10), 'perte_poids': round(rng.uniform(0, 15), 1),
+    })
+    return patient
+
+async def http_request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def client(host, port, deadline, seed, latencies, errors):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, 'POST', '/score', random_patient(rng))
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def wait_for_service(host, port, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+async def run_load(args):
+    await wait_for_service(args.host, args.port)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(client(args.host, args.port, deadline, seed, latencies, errors)
+                           for seed in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, metrics = await http_request(reader, writer, 'GET', '/metrics')
+    writer.close()
+
+    latencies_ms = np.asarray(latencies) * 1000
+    print(f"{len(latencies):,} requêtes en {elapsed:.1f} s avec {args.concurrency} clients: "
+          f"{len(latencies) / elapsed:,.0f} requêtes/s, {len(errors)} erreurs")
+    print("latence client (ms): " + ", ".join(
+        f"p{p}={np.percentile(latencies_ms, p):.2f}" for p in (50, 90, 99)))
+    print(f"latence service (ms): {metrics['latency_ms']}")
+    print(f"lots: {metrics['batches']:,} (taille moyenne {metrics['mean_batch_size']}), "
+          f"histogramme {metrics['batch_size_histogram']}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Charge HTTP sur scoring_service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--spawn", action="store_true", help="Démarrer le service pour la mesure")
+    parser.add_argument("--moteur", default="regles")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    service = None
+    if args.spawn:
+        service = subprocess.Popen(
+            [sys.executable, "-m", "scoring_service", "--host", args.host, "--port", str(args.port),
+             "--moteur", args.moteur, "--max-batch", str(args.max_batch), "--max-wait-ms", str(args.max_wait_ms)],
+            cwd=ROOT)
+    try:
+        asyncio.run(run_load(args))
+    finally:
+        if service:
+            service.terminate()
+            service.wait()
+
+if __name__ == "__main__":
+    main()
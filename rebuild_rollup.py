@@ -0,0 +1,45 @@
+# rebuild_rollup.py - Recalcule la synthèse quotidienne patients_daily_rollup (rattrapage)
+# Usage: python -m rebuild_rollup [URL]
+#   URL: URL SQLAlchemy de la base (défaut: sqlite:/// + TB_SQLITE_PATH)
+#
+# Les triggers de la table patients tiennent la synthèse à jour à chaque écriture;
+# ce script la reconstruit entièrement (après un chargement hors triggers, une
+# restauration ou une correction manuelle de patients).
+import argparse
+import logging
+import sys
+import time
+
+from sqlalchemy import create_engine
+
+logging.disable(logging.WARNING)
+
+import app  # noqa: E402
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m rebuild_rollup",
+                                     description="Reconstruit patients_daily_rollup depuis patients")
+    parser.add_argument("url", nargs="?", default=f"sqlite:///{app.SQLITE_PATH}",
+                        help="URL SQLAlchemy de la base")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    engine = app.create_sqlite_engine(args.url[len("sqlite:///"):]) \
+        if args.url.startswith("sqlite:///") else create_engine(args.url)
+    try:
+        # La migration 3 crée la table et ses triggers (et la remplit) si besoin
+        applied = app.run_migrations(engine)
+        start = time.perf_counter()
+        groups = app.rebuild_daily_rollup(engine)
+    except Exception as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
+    if applied:
+        print(f"Migrations appliquées: {', '.join(map(str, applied))}", file=sys.stderr)
+    print(f"{app.ROLLUP_TABLE}: {groups:,} groupes recalculés en {time.perf_counter() - start:.1f} s",
+          file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
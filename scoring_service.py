@@ -0,0 +1,275 @@
+# scoring_service.py - Service HTTP/JSON local de scoring tuberculose (asyncio, micro-lots)
+# Usage: python -m scoring_service [--host 127.0.0.1] [--port 8765] [--moteur regles|modele]
+#                                  [--max-batch 64] [--max-wait-ms 5]
+#
+#   POST /score    {"age": 45, "genre": "Homme", "douleur_thoracique": "Légère", ...}
+#                  ou {"patients": [{...}, {...}]}
+#                  -> {"prediction": 1, "probabilite": 0.7, "niveau_risque": "Élevé", "couleur": "red"}
+#   GET  /metrics  latences p50/p90/p99, histogramme des tailles de lots
+#   GET  /health
+#
+# Les requêtes concurrentes sont regroupées en micro-lots (max_batch patients ou
+# max_wait secondes après le premier) et scorées en un seul appel vectorisé.
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+logging.disable(logging.WARNING)
+
+import app  # noqa: E402
+from batch_scoring import SCORING_ENGINES, make_scorer  # noqa: E402
+
+MAX_BATCH = 64
+MAX_WAIT = 0.005
+MAX_BODY_BYTES = 1 << 20
+# Fenêtre des latences conservées pour les percentiles
+LATENCY_WINDOW = 10_000
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+def encode_patient(patient):
+    """Vecteur de scoring (ordre PREDICTION_FEATURES) à partir des modalités du formulaire
+
+    Les variables catégorielles acceptent le libellé du formulaire ou son code.
+    """
+    row = []
+    for column in app.PREDICTION_FEATURES:
+        if column not in patient:
+            raise ValueError(f"champ manquant: {column}")
+        value = patient[column]
+        if column in app.FORM_ENCODINGS and isinstance(value, str):
+            if value not in app.FORM_ENCODINGS[column]:
+                choices = ', '.join(app.FORM_ENCODINGS[column])
+                raise ValueError(f"{column}: modalité inconnue {value!r} (attendu: {choices})")
+            value = app.FORM_ENCODINGS[column][value]
+        try:
+            row.append(float(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"{column}: valeur non numérique {value!r}") from None
+    return row
+
+def batch_size_bucket(size):
+    """Classe de l'histogramme des tailles de lots: 1, 2, 3-4, 5-8, 9-16..."""
+    if size <= 2:
+        return str(size)
+    upper = 1 << (size - 1).bit_length()
+    return f"{upper // 2 + 1}-{upper}"
+
+class ServiceMetrics:
+    """Latences (fenêtre glissante) et tailles des micro-lots"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.time()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.patients = 0
+        self.batches = 0
+        self.batch_sizes = {}
+
+    def record_request(self, seconds, error=False):
+        self.requests += 1
+        self.errors += int(error)
+        self.latencies.append(seconds)
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.patients += size
+        bucket = batch_size_bucket(size)
+        self.batch_sizes[bucket] = self.batch_sizes.get(bucket, 0) + 1
+
+    def snapshot(self, queue_depth=0):
+        latencies_ms = np.asarray(self.latencies) * 1000
+        percentiles = {}
+        if len(latencies_ms):
+            for p in (50, 90, 99):
+                percentiles[f"p{p}"] = round(float(np.percentile(latencies_ms, p)), 3)
+        ordered = sorted(self.batch_sizes.items(), key=lambda item: int(item[0].split('-')[0]))
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'errors': self.errors,
+            'patients': self.patients,
+            'batches': self.batches,
+            'mean_batch_size': round(self.patients / self.batches, 2) if self.batches else 0.0,
+            'queue_depth': queue_depth,
+            'latency_ms': percentiles,
+            'batch_size_histogram': dict(ordered),
+        }
+
+class MicroBatcher:
+    """Regroupe les patients en attente et les score par lots dans la boucle asyncio
+
+    Un lot part dès max_batch patients ou max_wait secondes après l'arrivée du
+    premier; le scoring vectorisé d'un lot prend quelques dizaines de microsecondes.
+    """
+
+    def __init__(self, scorer, metrics, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.scorer = scorer
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+
+    async def score(self, rows):
+        """Score une liste de vecteurs; retourne [(prediction, probabilite), ...]"""
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in rows]
+        for row, future in zip(rows, futures):
+            self.queue.put_nowait((row, future))
+        return await asyncio.gather(*futures)
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch:
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            remaining = deadline - asyncio.get_running_loop().time()
+            if len(batch) >= self.max_batch or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                predictions, probabilities = self.scorer.predict_batch(np.array([row for row, _ in batch]))
+                for (_, future), prediction, probability in zip(batch, predictions, probabilities):
+                    if not future.done():
+                        future.set_result((int(prediction), float(probability)))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            self.metrics.record_batch(len(batch))
+
+def score_response(prediction, probability):
+    niveau, couleur, _ = app.calculate_risk_level(probability)
+    return {'prediction': prediction, 'probabilite': probability, 'niveau_risque': niveau, 'couleur': couleur}
+
+class ScoringService:
+    """Serveur HTTP/1.1 minimal (keep-alive, corps JSON) au-dessus d'asyncio.start_server"""
+
+    def __init__(self, scorer, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(scorer, self.metrics, max_batch=max_batch, max_wait=max_wait)
+
+    async def handle_score(self, body):
+        payload = json.loads(body or b'{}')
+        patients = payload['patients'] if isinstance(payload, dict) and 'patients' in payload else payload
+        single = isinstance(patients, dict)
+        patients = [patients] if single else patients
+        if not isinstance(patients, list) or not all(isinstance(p, dict) for p in patients):
+            raise ValueError("corps attendu: un patient (objet JSON) ou {\"patients\": [...]}")
+        rows = [encode_patient(patient) for patient in patients]
+        results = [score_response(*result) for result in await self.batcher.score(rows)]
+        return results[0] if single else {'resultats': results}
+
+    async def route(self, method, path, body):
+        if path == '/score':
+            if method != 'POST':
+                return 405, {'erreur': "utiliser POST"}
+            return 200, await self.handle_score(body)
+        if path == '/metrics':
+            return 200, self.metrics.snapshot(self.batcher.queue.qsize())
+        if path == '/health':
+            return 200, {'statut': 'ok', 'moteur': self.batcher.scorer.name}
+        return 404, {'erreur': f"route inconnue: {path}"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    status, response = 413, {'erreur': f"corps limité à {MAX_BODY_BYTES} octets"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    keep_alive = (headers.get('connection', '').lower() != 'close'
+                                  and version.upper() == 'HTTP/1.1')
+                    try:
+                        status, response = await self.route(method, path.split('?')[0], body)
+                    except (ValueError, KeyError, TypeError) as e:
+                        status, response = 400, {'erreur': str(e)}
+                    except Exception as e:
+                        status, response = 500, {'erreur': str(e)}
+
+                data = json.dumps(response, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if path.startswith('/score'):
+                    self.metrics.record_request(time.perf_counter() - start, error=status != 200)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port, ready=None):
+        batcher_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher_task.cancel()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scoring_service",
+                                     description="Service HTTP/JSON local de scoring tuberculose")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--moteur", choices=list(SCORING_ENGINES), default='regles')
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT * 1000)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    service = ScoringService(make_scorer(args.moteur), max_batch=args.max_batch,
+                             max_wait=args.max_wait_ms / 1000)
+
+    def ready(server):
+        print(f"Scoring ({SCORING_ENGINES[args.moteur]}) sur http://{args.host}:{args.port} "
+              f"(lots ≤ {args.max_batch}, attente ≤ {args.max_wait_ms:g} ms)", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready=ready))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()